@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from models.schemas import FAQRequest, FAQResponse
+import json
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -27,24 +29,55 @@ async def ask_faq(request: FAQRequest, app_request: Request):
                 detail="RAG system not initialized"
             )
         
-        logger.info(f"Processing question: {request.question}")
+        logger.info("Processing question: %s", request.question)
         
-        response = rag_system.ask(
+        response = await rag_system.ask(
             question=request.question,
             conversation_history=request.conversation_history
         )
         
-        logger.info(f"Answer generated with confidence: {response.confidence}")
+        logger.info("Answer generated with confidence: %s", response.confidence)
         
         return response
         
     except Exception as e:
-        logger.error(f"Error processing FAQ request: {str(e)}")
+        logger.error("Error processing FAQ request: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error processing request: {str(e)}"
         )
 
+@router.post("/ask-faq-stream")
+async def ask_faq_stream(request: FAQRequest, app_request: Request):
+    """
+    Ask a question and stream the answer as Server-Sent Events
+    
+    Args:
+        request: FAQRequest with question and optional conversation history
+        
+    Returns:
+        StreamingResponse emitting a metadata event (sources, confidence,
+        follow-ups), then answer tokens, then a done event
+    """
+    rag_system = app_request.app.state.rag_system
+    
+    if not rag_system:
+        raise HTTPException(
+            status_code=500,
+            detail="RAG system not initialized"
+        )
+    
+    logger.info("Streaming answer for question: %s", request.question)
+    
+    async def event_stream():
+        async for event in rag_system.ask_stream(
+            question=request.question,
+            conversation_history=request.conversation_history
+        ):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @router.get("/health")
 async def health_check(app_request: Request):
     """Check if the RAG system is healthy"""
@@ -59,6 +59,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "ask_faq": "/api/ask-faq",
+            "ask_faq_stream": "/api/ask-faq-stream",
             "health": "/api/health"
         }
     }
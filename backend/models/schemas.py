@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 
 class FAQRequest(BaseModel):
@@ -9,8 +9,8 @@ class FAQRequest(BaseModel):
         description="Previous conversation context for continuity"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "question": "What are the symptoms of common cold?",
                 "conversation_history": [
@@ -19,9 +19,12 @@ class FAQRequest(BaseModel):
                 ]
             }
         }
+    )
 
 class SourceDocument(BaseModel):
     """Model for retrieved source documents"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     content: str = Field(..., description="Retrieved document content")
     tag: str = Field(..., description="Intent tag from source")
     relevance_score: float = Field(..., description="Similarity score", ge=0.0, le=1.0)
@@ -43,8 +46,12 @@ class FAQResponse(BaseModel):
         description="Suggested follow-up questions"
     )
     
-    class Config:
-        json_schema_extra = {
+    # Instances are built internally with model_construct (skipping validation)
+    # and shared through the semantic cache, so they are immutable
+    model_config = ConfigDict(
+        frozen=True,
+        extra='forbid',
+        json_schema_extra={
             "example": {
                 "answer": "Common cold symptoms include runny or stuffy nose, sore throat, cough, congestion, slight body aches, sneezing, and low-grade fever.",
                 "sources": [
@@ -61,6 +68,7 @@ class FAQResponse(BaseModel):
                 ]
             }
         }
+    )
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Any, List, Optional
+
+import numpy as np
+
+from models.schemas import FAQResponse
+
+
+class VectorRing:
+    """
+    Fixed-capacity ring buffer of unit vectors, each paired with a value.
+
+    Storage is preallocated on the first put once the dimension is known, so
+    adding an entry writes a single row instead of copying the buffer; once
+    full, the oldest entry is overwritten. Not thread-safe: callers hold
+    their own lock.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity: Maximum number of entries; 0 or less stores nothing
+        """
+        self.capacity = capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._timestamps: Optional[np.ndarray] = None
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Monotonic insertion times of the filled slots"""
+        if self._size == 0:
+            return np.empty(0)
+        return self._timestamps[:self._size]
+
+    def similarities(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Dot products of a normalized query with every filled slot, or None if there are none"""
+        if self._size == 0 or self._vectors.shape[1] != query.shape[0]:
+            return None
+        return self._vectors[:self._size] @ query
+
+    def value(self, slot: int) -> Any:
+        return self._values[slot]
+
+    def put(self, vector: np.ndarray, value: Any) -> None:
+        """Store a normalized vector and its value, overwriting the oldest entry when full"""
+        if self.capacity <= 0:
+            return
+
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self._timestamps = np.full(self.capacity, -np.inf)
+            self._values = [None] * self.capacity
+            self._size = 0
+            self._next = 0
+
+        self._vectors[self._next] = vector
+        self._values[self._next] = value
+        self._timestamps[self._next] = time.monotonic()
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self) -> None:
+        """Remove all entries and release the buffer"""
+        self._vectors = None
+        self._values = []
+        self._timestamps = None
+        self._size = 0
+        self._next = 0
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache of previously answered FAQ questions.
+
+    Each entry pairs an L2-normalized query embedding with the FAQResponse
+    produced for it. A lookup is a single matrix-vector product against all
+    cached embeddings; if the best cosine similarity clears the threshold the
+    stored response is reused, skipping both retrieval and the LLM call.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        max_size: int = 10_000,
+        ttl_seconds: float = 3600.0
+    ):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum number of cached entries (oldest overwritten
+                first); 0 or less disables the cache
+            ttl_seconds: Lifetime of a cached entry in seconds
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = VectorRing(max_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _live(self) -> np.ndarray:
+        """Mask of filled slots that have not outlived the TTL"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        return self._entries.timestamps >= cutoff
+
+    def get(self, embedding: List[float]) -> Optional[FAQResponse]:
+        """
+        Look up a cached response for a query embedding
+
+        Args:
+            embedding: Query embedding vector
+
+        Returns:
+            Cached FAQResponse if a similar enough query was seen, else None
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            similarities = self._entries.similarities(query)
+            if similarities is None:
+                return None
+
+            similarities[~self._live()] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self._entries.value(best)
+
+        return None
+
+    def put(self, embedding: List[float], response: FAQResponse) -> None:
+        """
+        Store a response for a query embedding, overwriting the oldest entry
+        once the cache is full
+
+        Args:
+            embedding: Query embedding vector
+            response: Response to cache
+        """
+        if self.max_size <= 0:
+            return
+        query = self._normalize(embedding)
+
+        with self._lock:
+            self._entries.put(query, response)
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._live().sum())
\ No newline at end of file
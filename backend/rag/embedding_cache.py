@@ -0,0 +1,160 @@
+from langchain_core.embeddings import Embeddings
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from rag.utils import SQLITE_LOOKUP_CHUNK
+
+
+class EmbeddingCache:
+    """Persistent content-hash -> float32 embedding store backed by SQLite"""
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the embedding cache
+        
+        Args:
+            path: SQLite database file to store embeddings in
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (h BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get(self, h: bytes) -> Optional[np.ndarray]:
+        """Return the cached vector for a hash, or None"""
+        return self.get_many([h]).get(h)
+    
+    def get_many(self, hashes: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return cached vectors for the given hashes (missing hashes are omitted)"""
+        hashes = list(dict.fromkeys(hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), SQLITE_LOOKUP_CHUNK):
+                chunk = hashes[start:start + SQLITE_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT h, vec FROM embeddings WHERE h IN ({placeholders})", chunk
+                )
+                for h, vec in rows:
+                    found[h] = np.frombuffer(vec, dtype=np.float32)
+        return found
+    
+    def put_many(self, hashes: List[bytes], vectors: List[List[float]]) -> None:
+        """Store vectors under their hashes in a single transaction"""
+        rows = [
+            (h, np.asarray(vector, dtype=np.float32).tobytes())
+            for h, vector in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (h, vec) VALUES (?, ?)", rows)
+            self._conn.commit()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings backend with a persistent EmbeddingCache so identical
+    documents are only ever embedded once, across restarts and re-ingestion.
+    
+    Queries are passed straight through: user questions are not persisted, and
+    the in-process LRU in EmbeddingManager already absorbs repeats.
+    """
+    
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, namespace: str = ""):
+        """
+        Initialize the cached embeddings
+        
+        Args:
+            embeddings: Backend that computes embeddings on a cache miss
+            cache: Persistent cache to consult first
+            namespace: Mixed into every hash (e.g. the model name) so vectors
+                from different models never collide
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self._prefix = f"{namespace}\0".encode("utf-8")
+    
+    def _hash(self, text: str) -> bytes:
+        return hashlib.sha256(self._prefix + text.encode("utf-8")).digest()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents, only sending uncached texts to the backend
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            List of embedding vectors
+        """
+        hashes = [self._hash(text) for text in texts]
+        cached = self.cache.get_many(hashes)
+        
+        # Embed each distinct missing text once
+        missing = {}
+        for h, text in zip(hashes, texts):
+            if h not in cached and h not in missing:
+                missing[h] = text
+        
+        if missing:
+            missing_hashes = list(missing)
+            vectors = self.embeddings.embed_documents([missing[h] for h in missing_hashes])
+            self.cache.put_many(missing_hashes, vectors)
+            for h, vector in zip(missing_hashes, vectors):
+                cached[h] = np.asarray(vector, dtype=np.float32)
+        
+        return [cached[h].tolist() for h in hashes]
+    
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query, bypassing the persistent cache
+        
+        Args:
+            text: Query text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        return self.embeddings.embed_query(text)
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query without touching SQLite on the event loop
+        
+        Args:
+            text: Query text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        return await self.embeddings.aembed_query(text)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents with the cache lookups run off the event loop
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            List of embedding vectors
+        """
+        return await asyncio.to_thread(self.embed_documents, texts)
\ No newline at end of file
@@ -1,30 +1,165 @@
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from typing import List
+from collections import OrderedDict
+from typing import List, Optional
+import hashlib
 import os
+import threading
 
-class EmbeddingManager:
+import numpy as np
+
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+class LocalEmbedder(Embeddings):
+    """Runs a sentence-transformers model on the local CPU/GPU"""
+    
+    def __init__(self, model: str = "BAAI/bge-small-en-v1.5"):
+        """
+        Initialize the local embedder
+        
+        Args:
+            model: sentence-transformers model name or path
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers is required for EMBEDDING_BACKEND=local. "
+                "Install it with: pip install sentence-transformers"
+            )
+        
+        self.model = SentenceTransformer(model)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            List of L2-normalized embedding vectors
+        """
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query
+        
+        Args:
+            text: Query text to embed
+            
+        Returns:
+            L2-normalized embedding vector
+        """
+        return self.embed_documents([text])[0]
+
+class NormalizedEmbeddings(Embeddings):
+    """Wraps an Embeddings instance so every vector it returns has unit L2 norm"""
+    
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        return self._normalize(vectors).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        return self._normalize(vector).tolist()
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        return self._normalize(vector).tolist()
+
+class EmbeddingManager(Embeddings):
     """Manages embeddings for the RAG system"""
     
-    def __init__(self, model: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache_size: int = 4096,
+        backend: Optional[str] = None,
+        cache_path: Optional[str] = None
+    ):
         """
         Initialize embedding manager
         
         Args:
-            model: OpenAI embedding model to use
+            model: Embedding model to use (defaults to EMBEDDING_MODEL, then
+                text-embedding-3-small for OpenAI or bge-small-en-v1.5 locally)
+            cache_size: Maximum number of query embeddings kept in the in-process LRU cache
+            backend: "openai" or "local" (defaults to EMBEDDING_BACKEND, then "openai")
+            cache_path: SQLite file for a persistent embedding cache shared
+                across restarts; no persistent cache when None
         """
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        backend = (backend or os.getenv("EMBEDDING_BACKEND", "openai")).lower()
+        model = model or os.getenv("EMBEDDING_MODEL")
+        
+        if backend == "local":
+            model = model or "BAAI/bge-small-en-v1.5"
+            self.embeddings = LocalEmbedder(model)
+        elif backend == "openai":
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY not found in environment variables")
+            
+            model = model or "text-embedding-3-small"
+            self.embeddings = OpenAIEmbeddings(
+                model=model
+            )
+        else:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        
+        # Queries skip the persistent cache so user questions are never written to disk
+        self._query_embeddings = self.embeddings
+        if cache_path:
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                EmbeddingCache(cache_path),
+                namespace=f"{backend}:{model}"
+            )
         
-   
-        self.embeddings = OpenAIEmbeddings(
-            model=model
-        )
+        self.backend = backend
+        self.model = model
+        self.cache_size = cache_size
+        # Query vectors only, as float32 arrays; documents go through the persistent cache
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _query_cache_key(text: str) -> bytes:
+        """Queries are keyed case- and whitespace-insensitively so rephrasings hit"""
+        return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+    
+    def _cache_put(self, key: bytes, vector: List[float]) -> None:
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Embed a list of documents
         
+        Documents bypass the in-process LRU so ingestion never evicts query
+        entries; the persistent cache, when configured, skips known texts.
+        
         Args:
             texts: List of text strings to embed
             
@@ -43,8 +178,62 @@ class EmbeddingManager:
         Returns:
             Embedding vector
         """
-        return self.embeddings.embed_query(text)
+        key = self._query_cache_key(text)
+        vector = self._cache_get(key)
+        if vector is None:
+            vector = self._query_embeddings.embed_query(text)
+            self._cache_put(key, vector)
+            return vector
+        return vector.tolist()
+    
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, sending only LRU misses to the backend in one call
+        
+        Args:
+            texts: Query texts to embed
+            
+        Returns:
+            One embedding vector per query, in order
+        """
+        keys = [self._query_cache_key(text) for text in texts]
+        vectors = [self._cache_get(key) for key in keys]
+        
+        # Embed each distinct missing query once
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            embedded = self._query_embeddings.embed_documents(list(missing.values()))
+            for key, vector in zip(list(missing), embedded):
+                self._cache_put(key, vector)
+                missing[key] = vector
+        
+        return [
+            missing[key] if vector is None else vector.tolist()
+            for key, vector in zip(keys, vectors)
+        ]
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query without blocking the event loop
+        
+        Args:
+            text: Query text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        key = self._query_cache_key(text)
+        vector = self._cache_get(key)
+        if vector is None:
+            vector = await self._query_embeddings.aembed_query(text)
+            self._cache_put(key, vector)
+            return vector
+        return vector.tolist()
     
     def get_embeddings_instance(self):
-        """Get the underlying embeddings instance for LangChain"""
-        return self.embeddings
\ No newline at end of file
+        """Get the embeddings instance for LangChain (this cached wrapper around the backend)"""
+        return self
\ No newline at end of file
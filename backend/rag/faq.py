@@ -2,19 +2,37 @@ from langchain_core.documents import Document
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-from typing import List, Dict, Optional
-import json
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import logging
 import os
+import re
+import numpy as np
 
 from rag.vector_store import VectorStoreManager
+from rag.sqlite_vec_store import SqliteVecBackend
+from rag.cache import SemanticCache
+from rag.utils import json_dumps, json_loads
 from models.schemas import FAQResponse, SourceDocument
 
 
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\w+')
+
+# Bump whenever prepare_documents or _extract_keywords change how documents
+# are built, so snapshots made by older code are rebuilt instead of reused
+_SNAPSHOT_VERSION = 1
+
+
 class FAQRagSystem:
     def __init__(self, data_path: str, vector_db_path: str, collection_name: str):
         self.data_path = data_path
-        self.vector_store_manager = VectorStoreManager(vector_db_path, collection_name)
+        if os.getenv("MEDRAG_BACKEND", "chroma").lower() == "sqlite_vec":
+            self.vector_store_manager = SqliteVecBackend(vector_db_path, collection_name)
+        else:
+            self.vector_store_manager = VectorStoreManager(vector_db_path, collection_name)
         self.llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0.2
@@ -22,17 +40,35 @@ class FAQRagSystem:
         self.qa_chain = None
         self.intents_data = None
         self.retriever = None
+        self.response_cache = SemanticCache(
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97")),
+            max_size=int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+        )
+        self.use_llm_always = os.getenv("USE_LLM_ALWAYS", "false").lower() == "true"
+        self.direct_answer_threshold = float(os.getenv("DIRECT_ANSWER_THRESHOLD", "0.85"))
+        self.direct_answer_margin = float(os.getenv("DIRECT_ANSWER_MARGIN", "0.05"))
+        self._build_conversational_matchers()
+        self._build_follow_up_index()
+        self._keyword_map_items = [
+            ('covid', ['coronavirus', 'covid-19', 'pandemic', 'mask', 'protocol', 'safety']),
+            ('insurance', ['coverage', 'provider', 'billing', 'payment']),
+            ('hours', ['schedule', 'open', 'closed', 'time', 'operation']),
+            ('location', ['address', 'where', 'parking', 'directions']),
+            ('cancellation', ['cancel', 'reschedule', 'policy']),
+            ('appointment', ['visit', 'booking', 'schedule'])
+        ]
 
     def load_intents_data(self) -> List[Dict]:
         """Load intents data from JSON file - supports both formats"""
-        print(f"Loading intents data from {self.data_path}...")
+        logger.info("Loading intents data from %s...", self.data_path)
         
         if not os.path.exists(self.data_path):
-            print(f"Warning: Intents file not found at {self.data_path}")
+            logger.warning("Intents file not found at %s", self.data_path)
             return []
         
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(self.data_path, 'rb') as f:
+            data = json_loads(f.read())
             
             if isinstance(data, dict) and 'intents' in data:
                 self.intents_data = data.get('intents', [])
@@ -41,10 +77,10 @@ class FAQRagSystem:
             elif isinstance(data, dict) and not 'intents' in data:
                 self.intents_data = self._convert_qa_to_intents(data)
             else:
-                print("Warning: Unexpected intents.json format")
+                logger.warning("Unexpected intents.json format")
                 self.intents_data = []
         
-        print(f"Loaded {len(self.intents_data)} intents")
+        logger.info("Loaded %d intents", len(self.intents_data))
         return self.intents_data
 
     def _convert_qa_to_intents(self, qa_data: Dict) -> List[Dict]:
@@ -73,7 +109,7 @@ class FAQRagSystem:
                     }
                     intents.append(intent)
         
-        print(f"Converted {len(intents)} Q&A pairs to intents format")
+        logger.info("Converted %d Q&A pairs to intents format", len(intents))
         return intents
 
     def prepare_documents(self) -> List[Document]:
@@ -99,62 +135,136 @@ class FAQRagSystem:
                 metadata={
                     "tag": tag,
                     "category": category,
-                    "patterns": json.dumps(patterns),
-                    "responses": json.dumps(responses),
+                    "patterns": json_dumps(patterns),
+                    "responses": json_dumps(responses),
                     "source": "intents.json"
                 }
             )
             documents.append(doc)
         
-        print(f"Prepared {len(documents)} documents for vector store")
+        logger.info("Prepared %d documents for vector store", len(documents))
         return documents
 
     def _extract_keywords(self, category: str, patterns: List[str], responses: List[str]) -> List[str]:
         """Extract keywords for better semantic matching"""
         keywords = [category]
         
-        keyword_map = {
-            'covid': ['coronavirus', 'covid-19', 'pandemic', 'mask', 'protocol', 'safety'],
-            'insurance': ['coverage', 'provider', 'billing', 'payment'],
-            'hours': ['schedule', 'open', 'closed', 'time', 'operation'],
-            'location': ['address', 'where', 'parking', 'directions'],
-            'cancellation': ['cancel', 'reschedule', 'policy'],
-            'appointment': ['visit', 'booking', 'schedule']
-        }
+        tokens = set()
+        for text in patterns + responses:
+            tokens.update(_WORD_RE.findall(text.lower()))
+        # Match plurals too ("appointments" -> "appointment")
+        tokens.update([token[:-1] for token in tokens if token.endswith('s')])
         
-        text = ' '.join(patterns + responses).lower()
-        for key, values in keyword_map.items():
-            if key in text:
+        for key, values in self._keyword_map_items:
+            if key in tokens:
                 keywords.extend(values)
         
-        return list(set(keywords))
+        return list(dict.fromkeys(keywords))
 
     def initialize(self, force_recreate: bool = False) -> None:
         """Initialize the RAG system"""
         self.load_intents_data()
         
         if not self.intents_data or len(self.intents_data) == 0:
-            print("Warning: No intents data loaded. System will have no knowledge base.")
+            logger.warning("No intents data loaded. System will have no knowledge base.")
             return
         
         vector_store_exists = os.path.exists(self.vector_store_manager.persist_directory)
         
         if force_recreate or not vector_store_exists:
-            print("Creating new vector store...")
-            documents = self.prepare_documents()
-            if documents:
-                self.vector_store_manager.create_vector_store(documents)
-            else:
-                print("Warning: No documents to create vector store")
-                return
+            logger.info("Creating new vector store...")
+            documents, embeddings = self._load_document_snapshot()
+            if documents is None:
+                documents = self.prepare_documents()
+                if not documents:
+                    logger.warning("No documents to create vector store")
+                    return
+                embeddings = np.asarray(
+                    self.vector_store_manager.embedding_manager.embed_documents(
+                        [doc.page_content for doc in documents]
+                    ),
+                    dtype=np.float32
+                )
+                self._save_document_snapshot(documents, embeddings)
+            self.vector_store_manager.create_vector_store(documents, embeddings=embeddings)
         else:
-            print("Loading existing vector store...")
+            logger.info("Loading existing vector store...")
             self.vector_store_manager.load_vector_store()
+            documents, embeddings = self._load_document_snapshot()
+            if documents is not None and len(documents) == self.vector_store_manager.get_collection_count():
+                self.vector_store_manager.build_memory_index(documents, embeddings)
         
         self._create_qa_chain()
         
         doc_count = self.vector_store_manager.get_collection_count()
-        print(f"RAG system initialized with {doc_count} documents")
+        logger.info("RAG system initialized with %d documents", doc_count)
+
+    def _snapshot_paths(self) -> Tuple[str, str]:
+        """Paths of the prepared-documents snapshot, kept next to the vector store"""
+        snapshot_dir = self.vector_store_manager.persist_directory.rstrip(os.sep) + "_snapshot"
+        return (
+            os.path.join(snapshot_dir, "documents.json"),
+            os.path.join(snapshot_dir, "documents_embeddings.npy")
+        )
+
+    def _snapshot_fingerprint(self) -> str:
+        """Fingerprint of the intents file, document format and embedding model the snapshot was built from"""
+        embedding_manager = self.vector_store_manager.embedding_manager
+        digest = hashlib.sha256(
+            f"v{_SNAPSHOT_VERSION}:{embedding_manager.backend}:{embedding_manager.model}".encode("utf-8")
+        )
+        digest.update(json_dumps(self._keyword_map_items).encode("utf-8"))
+        with open(self.data_path, 'rb') as f:
+            digest.update(f.read())
+        return digest.hexdigest()
+
+    def _load_document_snapshot(self) -> Tuple[Optional[List[Document]], Optional[np.ndarray]]:
+        """
+        Load prepared documents and their embeddings if they were built from
+        the current intents file, so a recreate skips re-embedding.
+        """
+        documents_path, embeddings_path = self._snapshot_paths()
+        if not (os.path.exists(documents_path) and os.path.exists(embeddings_path)):
+            return None, None
+        
+        try:
+            with open(documents_path, 'rb') as f:
+                snapshot = json_loads(f.read())
+            if snapshot.get("fingerprint") != self._snapshot_fingerprint():
+                logger.info("Document snapshot is stale, rebuilding...")
+                return None, None
+            
+            documents = [
+                Document(page_content=item["page_content"], metadata=item["metadata"])
+                for item in snapshot["documents"]
+            ]
+            embeddings = np.load(embeddings_path, mmap_mode='r')
+            if embeddings.shape[0] != len(documents):
+                logger.warning("Document snapshot is inconsistent, rebuilding...")
+                return None, None
+        except Exception as e:
+            logger.warning("Could not load document snapshot: %s", e)
+            return None, None
+        
+        logger.info("Loaded %d prepared documents and embeddings from snapshot", len(documents))
+        return documents, embeddings
+
+    def _save_document_snapshot(self, documents: List[Document], embeddings: np.ndarray) -> None:
+        """Persist prepared documents and their embeddings for the next startup"""
+        documents_path, embeddings_path = self._snapshot_paths()
+        try:
+            os.makedirs(os.path.dirname(documents_path), exist_ok=True)
+            np.save(embeddings_path, embeddings)
+            with open(documents_path, 'w', encoding='utf-8') as f:
+                f.write(json_dumps({
+                    "fingerprint": self._snapshot_fingerprint(),
+                    "documents": [
+                        {"page_content": doc.page_content, "metadata": doc.metadata}
+                        for doc in documents
+                    ]
+                }))
+        except Exception as e:
+            logger.warning("Could not save document snapshot: %s", e)
 
     def _format_docs(self, docs: List[Document]) -> str:
         """Format documents for the prompt"""
@@ -183,72 +293,110 @@ Answer:"""
         )
 
         if not self.vector_store_manager.vector_store:
-            print("Warning: Vector store not available, cannot create retriever")
+            logger.warning("Vector store not available, cannot create retriever")
             return
         
-        self.retriever = self.vector_store_manager.vector_store.as_retriever(
+        self.retriever = self.vector_store_manager.as_retriever(
             search_kwargs={"k": 5}  
         )
 
-        self.qa_chain = (
-            {
-                "context": self.retriever | self._format_docs,
-                "question": RunnablePassthrough()
-            }
-            | prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        # Retrieval happens once in ask(); the chain receives the formatted context
+        self.qa_chain = prompt | self.llm | StrOutputParser()
+
+    def _build_conversational_matchers(self) -> None:
+        """Precompute lookup tables for conversational queries"""
+        greetings = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings']
+        status_queries = ['how are you', 'how r you', 'how do you do', 'whats up', "what's up", 'how are things']
+        thanks = ['thank you', 'thanks', 'thx', 'appreciate it', 'thank u']
+        goodbye = ['bye', 'goodbye', 'see you', 'take care', 'good bye', 'later', 'have a good day']
+        
+        def alternation(phrases: List[str]) -> str:
+            return '|'.join(map(re.escape, phrases))
+        
+        # A phrase matches on its own or followed by a separator, never as a word prefix
+        self._greet_re = re.compile(rf"^(?:{alternation(greetings)})(?:[ ,]|$)", re.IGNORECASE)
+        self._status_re = re.compile(alternation(status_queries), re.IGNORECASE)
+        self._thanks_re = re.compile(rf"^(?:{alternation(thanks)})(?:[ !]|$)", re.IGNORECASE)
+        self._goodbye_re = re.compile(rf"^(?:{alternation(goodbye)})(?:[ !]|$)", re.IGNORECASE)
+        
+        self._conversational_responses = {
+            'greeting': "Hello! I'm your clinic assistant. I can help you with information about our clinic hours, location, insurance, billing, appointment policies, and visit preparation. What would you like to know?",
+            'status': "I'm doing great, thank you for asking! I'm here to help answer your questions about our clinic. What information can I provide for you today?",
+            'thanks': "You're very welcome! Feel free to ask if you have any other questions about our clinic services or policies.",
+            'goodbye': "Goodbye! Have a wonderful day. Feel free to reach out anytime you have questions about our clinic."
+        }
+
+    def _build_follow_up_index(self) -> None:
+        """Precompute follow-up suggestions per category with their lowercase forms"""
+        self._category_suggestions = {
+            'clinic_details': [
+                "What are your clinic hours?",
+                "Where is the clinic located?",
+                "Is parking available?"
+            ],
+            'insurance_billing': [
+                "What insurance providers do you accept?",
+                "What payment methods can I use?",
+                "Can you explain your billing policies?"
+            ],
+            'visit_preparation': [
+                "What documents do I need for my first visit?",
+                "What should I bring to my appointment?"
+            ],
+            'policies': [
+                "What's your cancellation policy?",
+                "What are your COVID-19 protocols?",
+                "What happens if I'm late?"
+            ]
+        }
+        # Only the first two suggestions of a category are ever offered
+        self._suggestion_lower = {
+            category: [(suggestion, suggestion.lower()) for suggestion in suggestions[:2]]
+            for category, suggestions in self._category_suggestions.items()
+        }
 
     def _is_conversational_query(self, question: str) -> tuple[bool, str]:
         """Check if query is conversational and return appropriate response"""
-        question_lower = question.lower().strip()
+        question = question.strip()
         
-        greetings = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings']
-        if any(question_lower == g or question_lower.startswith(f"{g} ") or question_lower.startswith(f"{g},") for g in greetings):
-            return True, "Hello! I'm your clinic assistant. I can help you with information about our clinic hours, location, insurance, billing, appointment policies, and visit preparation. What would you like to know?"
+        if self._greet_re.match(question):
+            return True, self._conversational_responses['greeting']
         
-        status_queries = ['how are you', 'how r you', 'how do you do', 'whats up', "what's up", 'how are things']
-        if any(q in question_lower for q in status_queries):
-            return True, "I'm doing great, thank you for asking! I'm here to help answer your questions about our clinic. What information can I provide for you today?"
+        if self._status_re.search(question):
+            return True, self._conversational_responses['status']
         
-        thanks = ['thank you', 'thanks', 'thx', 'appreciate it', 'thank u']
-        if any(question_lower == t or question_lower.startswith(f"{t} ") or question_lower.startswith(f"{t}!") for t in thanks):
-            return True, "You're very welcome! Feel free to ask if you have any other questions about our clinic services or policies."
+        if self._thanks_re.match(question):
+            return True, self._conversational_responses['thanks']
         
-        goodbye = ['bye', 'goodbye', 'see you', 'take care', 'good bye', 'later', 'have a good day']
-        if any(question_lower == g or question_lower.startswith(f"{g} ") or question_lower.startswith(f"{g}!") for g in goodbye):
-            return True, "Goodbye! Have a wonderful day. Feel free to reach out anytime you have questions about our clinic."
+        if self._goodbye_re.match(question):
+            return True, self._conversational_responses['goodbye']
         
         return False, ""
 
-    def _convert_distance_to_similarity(self, distance: float) -> float:
+    def _convert_distances_to_similarities(self, distances: np.ndarray) -> np.ndarray:
         """
-        Convert ChromaDB distance to similarity score.
+        Convert ChromaDB distances to similarity scores.
         ChromaDB with cosine distance returns values where:
         - 0 = identical (most similar)
         - 2 = opposite (least similar)
         
         We convert to 0-1 scale where 1 = most similar
         """
-    
-        if distance < 0:
-            similarity = 1.0 - (abs(distance) / 2)
-        else:
-            similarity = 1.0 - (distance / 2)
-        
-        return max(0.0, min(1.0, similarity))
+        return np.clip(1.0 - np.abs(distances) / 2.0, 0.0, 1.0)
 
-    def ask(
+    async def _precheck(
         self,
         question: str,
         conversation_history: Optional[List[Dict[str, str]]] = None
-    ) -> FAQResponse:
-        """Process a question and return an answer"""
-        
+    ) -> Tuple[Optional[FAQResponse], Optional[List[float]]]:
+        """
+        Return an immediate response for queries that need no retrieval or LLM
+        call, plus the query embedding to cache the eventual answer under (None
+        when the question has conversation history and is not cacheable).
+        """
         is_conversational, conv_response = self._is_conversational_query(question)
         if is_conversational:
-            return FAQResponse(
+            return FAQResponse.model_construct(
                 answer=conv_response,
                 sources=[],
                 confidence="high",
@@ -256,85 +404,245 @@ Answer:"""
                     "What are your clinic hours?",
                     "What insurance providers do you accept?"
                 ]
-            )
+            ), None
         
         if not self.qa_chain or not self.retriever:
-            return FAQResponse(
+            return FAQResponse.model_construct(
                 answer="I'm not properly initialized yet. Please make sure the knowledge base is loaded.",
                 sources=[],
                 confidence="low",
                 follow_up_suggestions=[]
+            ), None
+        
+        # The collection count (SQLite) and the cache lookup (embedding API)
+        # are independent, so run them concurrently
+        count_task = asyncio.to_thread(self.vector_store_manager.get_collection_count)
+        if conversation_history:
+            doc_count = await count_task
+            query_embedding, cached_response = None, None
+        else:
+            doc_count, (query_embedding, cached_response) = await asyncio.gather(
+                count_task,
+                self._cached_response(question)
             )
         
-        doc_count = self.vector_store_manager.get_collection_count()
         if doc_count == 0:
-            return FAQResponse(
+            return FAQResponse.model_construct(
                 answer="I don't have any information loaded yet. Please contact the clinic administrator.",
                 sources=[],
                 confidence="low",
                 follow_up_suggestions=[]
+            ), None
+        
+        return cached_response, query_embedding
+
+    async def _cached_response(self, question: str) -> Tuple[Optional[List[float]], Optional[FAQResponse]]:
+        """
+        Embed a standalone question and look it up in the semantic cache.
+        Answers that depend on prior turns are not reusable across users, so
+        callers only use this without conversation history.
+        """
+        query_embedding = await self.vector_store_manager.embedding_manager.aembed_query(question)
+        return query_embedding, self.response_cache.get(query_embedding)
+
+    def _contextualize_question(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> str:
+        """Prefix the question with the most recent conversation turns"""
+        if not conversation_history:
+            return question
+        
+        recent_context = conversation_history[-3:]
+        context_str = "\n".join([
+            f"{msg['role']}: {msg['content']}"
+            for msg in recent_context
+        ])
+        return f"Previous conversation:\n{context_str}\n\nCurrent question: {question}"
+
+    async def _retrieve(
+        self,
+        question: str,
+        contextualized_question: str
+    ) -> Tuple[List[Document], List[SourceDocument], str, List[str]]:
+        """Retrieve context documents and derive sources, confidence and follow-ups"""
+        docs_and_scores = await asyncio.to_thread(
+            self.vector_store_manager.similarity_search_with_score,
+            contextualized_question,
+            k=5
+        )
+        source_docs = [doc for doc, _ in docs_and_scores]
+        
+        top_results = docs_and_scores[:3]
+        similarities = self._convert_distances_to_similarities(
+            np.fromiter((distance for _, distance in top_results), dtype=np.float32, count=len(top_results))
+        )
+        
+        sources = []
+        for (doc, _), score in zip(top_results, similarities):
+            sources.append(SourceDocument.model_construct(
+                content=doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
+                tag=doc.metadata.get('tag', 'unknown'),
+                relevance_score=round(float(score), 3)
+            ))
+        
+        if sources and sources[0].relevance_score > 0.6:
+            confidence = "high"
+        elif sources and sources[0].relevance_score > 0.4:
+            confidence = "medium"
+        else:
+            confidence = "low"
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Top relevance score: %s, confidence: %s",
+                sources[0].relevance_score if sources else 0,
+                confidence
             )
         
+        follow_ups = self._generate_follow_ups(question, source_docs)
+        
+        return source_docs, sources, confidence, follow_ups
+
+    def _direct_answer(
+        self,
+        source_docs: List[Document],
+        sources: List[SourceDocument]
+    ) -> Optional[str]:
+        """
+        Return the canonical response of the best-matching intent when it is
+        a confident, unambiguous hit, so the LLM call can be skipped.
+        Returns None when the LLM should generate the answer.
+        """
+        if self.use_llm_always or not sources:
+            return None
+        
+        top_score = sources[0].relevance_score
+        runner_up_score = sources[1].relevance_score if len(sources) > 1 else 0.0
+        if top_score < self.direct_answer_threshold or top_score - runner_up_score < self.direct_answer_margin:
+            return None
+        
         try:
-            contextualized_question = question
-            if conversation_history and len(conversation_history) > 0:
-                recent_context = conversation_history[-3:]
-                context_str = "\n".join([
-                    f"{msg['role']}: {msg['content']}"
-                    for msg in recent_context
-                ])
-                contextualized_question = f"Previous conversation:\n{context_str}\n\nCurrent question: {question}"
-            
-            source_docs = self.retriever.invoke(contextualized_question)
-            
-            answer = self.qa_chain.invoke(contextualized_question)
-            
-            sources = []
-            search_results = self.vector_store_manager.similarity_search(question, k=5)
+            responses = json_loads(source_docs[0].metadata.get('responses', '[]'))
+        except ValueError:
+            return None
+        
+        return responses[0] if responses else None
+
+    async def ask(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> FAQResponse:
+        """Process a question and return an answer"""
+        
+        try:
+            early_response, query_embedding = await self._precheck(question, conversation_history)
+            if early_response is not None:
+                return early_response
             
-            for doc in source_docs[:3]:
-                score = 0.0
-                for search_doc, search_distance in search_results:
-                    if search_doc.page_content == doc.page_content:
-                        score = self._convert_distance_to_similarity(search_distance)
-                        break
-                
-                sources.append(SourceDocument(
-                    content=doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                    tag=doc.metadata.get('tag', 'unknown'),
-                    relevance_score=round(score, 3)
-                ))
+            contextualized_question = self._contextualize_question(question, conversation_history)
+            source_docs, sources, confidence, follow_ups = await self._retrieve(question, contextualized_question)
             
-            if sources and sources[0].relevance_score > 0.6:
+            answer = self._direct_answer(source_docs, sources)
+            if answer is not None:
                 confidence = "high"
-            elif sources and sources[0].relevance_score > 0.4:
-                confidence = "medium"
             else:
-                confidence = "low"
+                answer = await self.qa_chain.ainvoke({
+                    "context": self._format_docs(source_docs),
+                    "question": contextualized_question
+                })
             
-            print(f"Top relevance score: {sources[0].relevance_score if sources else 0}")
-            print(f"Confidence: {confidence}")
-            
-            follow_ups = self._generate_follow_ups(question, source_docs)
-            
-            return FAQResponse(
+            response = FAQResponse.model_construct(
                 answer=answer,
                 sources=sources,
                 confidence=confidence,
                 follow_up_suggestions=follow_ups
             )
             
+            if query_embedding is not None:
+                self.response_cache.put(query_embedding, response)
+            
+            return response
+            
         except Exception as e:
-            print(f"Error in ask method: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return FAQResponse(
+            logger.exception("Error in ask method: %s", e)
+            return FAQResponse.model_construct(
                 answer=f"I encountered an error processing your question. Please try rephrasing or contact our clinic directly.",
                 sources=[],
                 confidence="low",
                 follow_up_suggestions=[]
             )
 
+    async def ask_stream(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a question and stream the answer.
+        
+        Yields a "metadata" event with sources, confidence and follow-ups as
+        soon as retrieval finishes, then one "token" event per LLM chunk, and
+        finally a "done" event. Failures are reported as an "error" event.
+        """
+        try:
+            response, query_embedding = await self._precheck(question, conversation_history)
+            if response is not None:
+                yield {
+                    "type": "metadata",
+                    "sources": [source.model_dump() for source in response.sources],
+                    "confidence": response.confidence,
+                    "follow_up_suggestions": response.follow_up_suggestions
+                }
+                yield {"type": "token", "content": response.answer}
+                yield {"type": "done"}
+                return
+            
+            contextualized_question = self._contextualize_question(question, conversation_history)
+            source_docs, sources, confidence, follow_ups = await self._retrieve(question, contextualized_question)
+            
+            direct_answer = self._direct_answer(source_docs, sources)
+            if direct_answer is not None:
+                confidence = "high"
+            
+            yield {
+                "type": "metadata",
+                "sources": [source.model_dump() for source in sources],
+                "confidence": confidence,
+                "follow_up_suggestions": follow_ups
+            }
+            
+            if direct_answer is not None:
+                chunks = [direct_answer]
+                yield {"type": "token", "content": direct_answer}
+            else:
+                chunks = []
+                async for chunk in self.qa_chain.astream({
+                    "context": self._format_docs(source_docs),
+                    "question": contextualized_question
+                }):
+                    chunks.append(chunk)
+                    yield {"type": "token", "content": chunk}
+            
+            if query_embedding is not None:
+                self.response_cache.put(query_embedding, FAQResponse.model_construct(
+                    answer="".join(chunks),
+                    sources=sources,
+                    confidence=confidence,
+                    follow_up_suggestions=follow_ups
+                ))
+            
+        except Exception as e:
+            logger.exception("Error in ask_stream method: %s", e)
+            yield {
+                "type": "error",
+                "message": "I encountered an error processing your question. Please try rephrasing or contact our clinic directly."
+            }
+        
+        yield {"type": "done"}
+
     def _generate_follow_ups(
         self,
         question: str,
@@ -346,40 +654,18 @@ Answer:"""
         if not source_docs:
             return ["What are your clinic hours?", "What insurance do you accept?"]
         
-        categories = list(set([
-            doc.metadata.get('category', '') 
-            for doc in source_docs 
+        # Ordered by retrieval rank, most relevant category first
+        categories = list(dict.fromkeys(
+            doc.metadata.get('category')
+            for doc in source_docs
             if doc.metadata.get('category')
-        ]))
-        
-        category_suggestions = {
-            'clinic_details': [
-                "What are your clinic hours?",
-                "Where is the clinic located?",
-                "Is parking available?"
-            ],
-            'insurance_billing': [
-                "What insurance providers do you accept?",
-                "What payment methods can I use?",
-                "Can you explain your billing policies?"
-            ],
-            'visit_preparation': [
-                "What documents do I need for my first visit?",
-                "What should I bring to my appointment?"
-            ],
-            'policies': [
-                "What's your cancellation policy?",
-                "What are your COVID-19 protocols?",
-                "What happens if I'm late?"
-            ]
-        }
+        ))
         
+        question_lower = question.lower()
         for category in categories[:2]:
-            if category in category_suggestions:
-                suggestions = category_suggestions[category]
-                for suggestion in suggestions[:2]:
-                    if suggestion.lower() not in question.lower():
-                        follow_ups.append(suggestion)
+            for suggestion, suggestion_lower in self._suggestion_lower.get(category, ()):
+                if suggestion_lower not in question_lower:
+                    follow_ups.append(suggestion)
         
         follow_ups = list(dict.fromkeys(follow_ups))
         return follow_ups[:2] if follow_ups else ["What else can I help you with?"]
@@ -387,14 +673,15 @@ Answer:"""
     def add_documents(self, documents: List[Document]) -> None:
         """Add new documents to the vector store"""
         if not self.vector_store_manager.vector_store:
-            print("Creating new vector store with documents...")
+            logger.info("Creating new vector store with documents...")
             self.vector_store_manager.create_vector_store(documents)
         else:
-            print(f"Adding {len(documents)} documents to existing vector store...")
+            logger.info("Adding %d documents to existing vector store...", len(documents))
             self.vector_store_manager.add_documents(documents)
         
+        self.response_cache.clear()
         self._create_qa_chain()
-        print(f"Vector store now has {self.vector_store_manager.get_collection_count()} documents")
+        logger.info("Vector store now has %d documents", self.vector_store_manager.get_collection_count())
 
     def get_stats(self) -> Dict:
         """Get system statistics"""
@@ -402,5 +689,6 @@ Answer:"""
             "total_documents": self.vector_store_manager.get_collection_count(),
             "total_intents": len(self.intents_data) if self.intents_data else 0,
             "retriever_initialized": self.retriever is not None,
-            "qa_chain_initialized": self.qa_chain is not None
+            "qa_chain_initialized": self.qa_chain is not None,
+            "cached_responses": len(self.response_cache)
         }
\ No newline at end of file
@@ -0,0 +1,365 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from rag.embeddings import NormalizedEmbeddings
+from rag.utils import SQLITE_LOOKUP_CHUNK, json_dumps, json_loads
+from rag.vector_store import BaseVectorStoreManager, content_id, discard_directory, unit_relevance
+
+logger = logging.getLogger(__name__)
+
+def _load_sqlite_vec():
+    """Import sqlite-vec, failing early when it or extension loading is unavailable"""
+    try:
+        import sqlite_vec
+    except ImportError:
+        raise ImportError(
+            "sqlite-vec is required for MEDRAG_BACKEND=sqlite_vec. "
+            "Install it with: pip install sqlite-vec"
+        )
+    if not hasattr(sqlite3.Connection, "enable_load_extension"):
+        raise RuntimeError(
+            "This Python's sqlite3 module cannot load extensions, "
+            "which MEDRAG_BACKEND=sqlite_vec requires"
+        )
+    return sqlite_vec
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a database with sqlite-vec loaded and the documents table in place"""
+    sqlite_vec = _load_sqlite_vec()
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.enable_load_extension(True)
+    sqlite_vec.load(conn)
+    conn.enable_load_extension(False)
+    
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS documents ("
+        "rowid INTEGER PRIMARY KEY, "
+        "doc_id TEXT NOT NULL UNIQUE, "
+        "content TEXT NOT NULL, "
+        "metadata TEXT NOT NULL)"
+    )
+    conn.commit()
+    return conn
+
+
+class SqliteVecStore(VectorStore):
+    """
+    LangChain vector store over a sqlite-vec vec0 table.
+
+    Documents live in a plain table and their embeddings in a vec0 virtual
+    table sharing the same rowid; KNN is an exact brute-force scan inside
+    SQLite. Vectors are stored normalized and scores are squared L2 distances
+    between unit vectors (2 - 2 * cosine), the same convention the Chroma
+    backend returns, so results are interchangeable.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock, embedding_function: Embeddings):
+        """
+        Initialize the store
+        
+        Args:
+            conn: Connection with the sqlite-vec extension loaded
+            lock: Lock serializing use of the connection
+            embedding_function: Embeddings used to embed queries and texts
+        """
+        self._conn = conn
+        self._lock = lock
+        self.embedding_function = embedding_function
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        db_path: str = ":memory:",
+        **kwargs: Any
+    ) -> "SqliteVecStore":
+        """
+        Create a store over db_path (in-memory by default) holding texts
+        
+        Ids are content hashes, so any ids passed in kwargs are ignored.
+        """
+        store = cls(_connect(db_path), threading.Lock(), embedding)
+        store.add_texts(texts, metadatas)
+        return store
+
+    def _has_vectors(self) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vec_chunks'"
+        ).fetchone()
+        return row is not None
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
+        return self.add_embeddings(documents, self.embedding_function.embed_documents(texts))
+
+    def add_embeddings(self, documents: List[Document], embeddings: Iterable[List[float]]) -> List[str]:
+        """
+        Upsert documents with precomputed embeddings in a single transaction
+        
+        Ids are content hashes, so re-adding a document replaces its row.
+        
+        Returns:
+            Ids of the stored documents
+        """
+        vectors = NormalizedEmbeddings._normalize(np.asarray(embeddings, dtype=np.float32))
+        ids = [content_id(doc) for doc in documents]
+        
+        with self._lock, self._conn:
+            if not self._has_vectors():
+                self._conn.execute(
+                    f"CREATE VIRTUAL TABLE vec_chunks USING vec0(embedding float[{vectors.shape[1]}])"
+                )
+            
+            self._conn.executemany(
+                "INSERT INTO documents (doc_id, content, metadata) VALUES (?, ?, ?) "
+                "ON CONFLICT(doc_id) DO UPDATE SET content = excluded.content, metadata = excluded.metadata",
+                [
+                    (doc_id, doc.page_content, json_dumps(doc.metadata))
+                    for doc_id, doc in zip(ids, documents)
+                ]
+            )
+            
+            rowids = {}
+            for start in range(0, len(ids), SQLITE_LOOKUP_CHUNK):
+                chunk = ids[start:start + SQLITE_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rowids.update(self._conn.execute(
+                    f"SELECT doc_id, rowid FROM documents WHERE doc_id IN ({placeholders})", chunk
+                ))
+            
+            # vec0 has no upsert; clear any existing vector for the row first
+            rows = [rowids[doc_id] for doc_id in ids]
+            self._conn.executemany("DELETE FROM vec_chunks WHERE rowid = ?", [(row,) for row in rows])
+            self._conn.executemany(
+                "INSERT INTO vec_chunks (rowid, embedding) VALUES (?, ?)",
+                [(row, vector.tobytes()) for row, vector in zip(rows, vectors)]
+            )
+        
+        return ids
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def iter_documents(self, batch: int = 10_000) -> Iterator[Document]:
+        """Yield every document, fetching batch rows at a time"""
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, doc_id, content, metadata FROM documents "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch)
+                ).fetchall()
+            if not rows:
+                break
+            
+            for _, doc_id, content, metadata in rows:
+                yield Document(id=doc_id, page_content=content, metadata=json_loads(metadata))
+            last_rowid = rows[-1][0]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """Return the top-k documents with squared L2 distances (lower is more similar)"""
+        query = np.asarray(embedding, dtype=np.float32).tobytes()
+        params: List[Any] = [query, k]
+        
+        candidates = ""
+        if filter:
+            conditions = " AND ".join("json_extract(metadata, ?) = ?" for _ in filter)
+            candidates = f" AND rowid IN (SELECT rowid FROM documents WHERE {conditions})"
+            for key, value in filter.items():
+                params.extend([f'$."{key}"', value])
+        
+        with self._lock:
+            if not self._has_vectors():
+                return []
+            rows = self._conn.execute(
+                "SELECT d.doc_id, d.content, d.metadata, knn.distance "
+                "FROM (SELECT rowid, distance FROM vec_chunks "
+                f"      WHERE embedding MATCH ? AND k = ?{candidates}) knn "
+                "JOIN documents d ON d.rowid = knn.rowid "
+                "ORDER BY knn.distance",
+                params
+            ).fetchall()
+        
+        return [
+            (Document(id=doc_id, page_content=content, metadata=json_loads(metadata)), distance * distance)
+            for doc_id, content, metadata, distance in rows
+        ]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self.embedding_function.embed_query(query), k=k, filter=filter
+        )
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return unit_relevance
+
+
+class SqliteVecBackend(BaseVectorStoreManager):
+    """
+    Drop-in alternative to VectorStoreManager backed by sqlite-vec.
+    
+    Small and medium corpora are searched exactly by brute force inside a
+    single SQLite file, skipping Chroma's HNSW index and its slower inserts.
+    Selected with MEDRAG_BACKEND=sqlite_vec.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str,
+        collection_name: str,
+        query_cache_threshold: float = 0.97,
+        query_cache_size: int = 512,
+        quantize: Optional[bool] = None
+    ):
+        """
+        Open the database; arguments are as for BaseVectorStoreManager, with
+        the store kept in persist_directory/<collection_name>.sqlite3
+        """
+        _load_sqlite_vec()
+        
+        super().__init__(
+            persist_directory,
+            collection_name,
+            query_cache_threshold=query_cache_threshold,
+            query_cache_size=query_cache_size,
+            quantize=quantize
+        )
+        self.db_path = os.path.join(persist_directory, f"{collection_name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = _connect(self.db_path)
+
+    @property
+    def _location(self) -> str:
+        return self.db_path
+
+    def _open_new_store(self) -> None:
+        self.vector_store = SqliteVecStore(self._conn, self._lock, self._embed)
+
+    def _open_existing_store(self) -> None:
+        self.vector_store = SqliteVecStore(self._conn, self._lock, self._embed)
+
+    def _write_documents(self, documents: List[Document], embeddings: Optional[np.ndarray] = None) -> None:
+        if embeddings is None:
+            self.vector_store.add_texts(
+                [doc.page_content for doc in documents],
+                [doc.metadata for doc in documents]
+            )
+        else:
+            self.vector_store.add_embeddings(documents, embeddings)
+
+    def _query_store(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        filter_dict: Optional[Dict]
+    ) -> List[List[Tuple[Document, float]]]:
+        # vec0 answers one KNN query per statement
+        return [
+            self.vector_store.similarity_search_by_vector_with_score(vector, k=k, filter=filter_dict)
+            for vector in vectors
+        ]
+
+    def _count(self) -> int:
+        return self.vector_store.count()
+
+    def delete_collection(self) -> None:
+        """Delete all stored documents and vectors"""
+        with self._lock, self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS vec_chunks")
+            self._conn.execute("DELETE FROM documents")
+        logger.info("Deleted collection: %s", self.collection_name)
+        self._forget_contents()
+
+    def reset_vector_store(self) -> None:
+        """Completely reset the vector store (delete everything)"""
+        with self._lock:
+            self._conn.close()
+        
+        if os.path.exists(self.persist_directory):
+            discard_directory(self.persist_directory)
+            logger.info("Vector store directory deleted from %s", self.persist_directory)
+        
+        self._forget_contents()
+        
+        os.makedirs(self.persist_directory, exist_ok=True)
+        self._conn = _connect(self.db_path)
+
+    def iter_all_documents(self, batch: int = 10_000) -> Iterator[Document]:
+        """Yield every document in the store, fetching batch rows at a time"""
+        if not self.vector_store:
+            return
+        yield from self.vector_store.iter_documents(batch)
+
+    def get_all_raw(self) -> Tuple[List[str], List[str], List[dict]]:
+        """
+        Retrieve every document as parallel (ids, contents, metadatas) lists,
+        for callers that don't need Document objects
+        """
+        if not self.vector_store:
+            return [], [], []
+        with self._lock:
+            rows = self._conn.execute("SELECT doc_id, content, metadata FROM documents ORDER BY rowid").fetchall()
+        if not rows:
+            return [], [], []
+        ids, contents, metadatas = map(list, zip(*rows))
+        return ids, contents, [json_loads(metadata) for metadata in metadatas]
+
+    def check_for_duplicates(self) -> dict:
+        """Check if there are duplicate documents in the vector store"""
+        # Ids are content hashes, so every stored document is unique by construction
+        total = self.get_collection_count()
+        return {
+            'total_documents': total,
+            'unique_documents': total,
+            'duplicate_groups': 0,
+            'duplicates': []
+        }
\ No newline at end of file
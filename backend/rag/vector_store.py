@@ -1,79 +1,573 @@
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from typing import List, Dict, Tuple
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from typing import Any, Callable, ClassVar, Iterator, List, Dict, Tuple, Optional
+import logging
 import os
+import random
 import shutil
+import sqlite3
+import threading
+import time
+import numpy as np
 import chromadb
+from chromadb.api.shared_system_client import SharedSystemClient
 from chromadb.config import Settings
 
-from rag.embeddings import EmbeddingManager
+from rag.cache import VectorRing
+from rag.embeddings import EmbeddingManager, NormalizedEmbeddings
 
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
-class VectorStoreManager:
-    def __init__(self, persist_directory: str, collection_name: str):
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+logger = logging.getLogger(__name__)
+
+# Documents per Chroma add() call; large single adds degrade badly on SQLite
+_BATCH_SIZE = 128
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA synchronous=OFF",
+)
+
+# HNSW settings for new collections. Vectors are normalized before insert, so
+# inner product equals cosine similarity and costs a single dot per candidate
+_HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:construction_ef": 100,
+}
+
+# Factor turning a collection's native distance into squared L2 between unit
+# vectors (2 - 2 * cosine), the convention every search method here returns
+_DISTANCE_SCALE = {
+    "l2": 1.0,
+    "ip": 2.0,
+    "cosine": 2.0,
+}
+
+
+def unit_relevance(distance: float) -> float:
+    """Relevance in [0, 1] from a squared L2 distance between unit vectors, i.e. (1 + cosine) / 2"""
+    # Clamped so legacy collections holding un-normalized vectors stay in range
+    return min(1.0, max(0.0, 1.0 - distance / 4.0))
+
+
+def content_id(doc: Document) -> str:
+    """Deterministic id for a document, derived from its content"""
+    return blake2b(doc.page_content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def unique_documents(
+    documents: List[Document],
+    embeddings: Optional[np.ndarray] = None
+) -> Tuple[List[Document], Optional[np.ndarray]]:
+    """Drop documents whose content repeats an earlier one (first occurrence wins)"""
+    seen = set()
+    keep = []
+    for i, doc in enumerate(documents):
+        doc_id = content_id(doc)
+        if doc_id not in seen:
+            seen.add(doc_id)
+            keep.append(i)
+    
+    if len(keep) == len(documents):
+        return documents, embeddings
+    
+    logger.info("Skipping %d documents with duplicate content", len(documents) - len(keep))
+    unique = [documents[i] for i in keep]
+    if embeddings is not None:
+        embeddings = np.asarray(embeddings)[keep]
+    return unique, embeddings
+
+
+def discard_directory(path: str) -> None:
+    """
+    Remove a directory without waiting on per-file deletes.
+    
+    The directory is renamed aside (a single syscall) and deleted on a
+    background thread, so the path is free for reuse immediately. Falls
+    back to a blocking rmtree when the rename fails, e.g. across devices.
+    """
+    trash = f"{path.rstrip(os.sep)}.trash.{os.getpid()}.{time.time_ns()}"
+    try:
+        os.replace(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+    
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(trash,),
+        kwargs={"ignore_errors": True},
+        daemon=True
+    ).start()
+
+
+# Tables the SQL duplicate scan reads; present in Chroma's SQLite schema since 0.4
+_DUPLICATE_SCAN_TABLES = {"collections", "segments", "embeddings", "embedding_metadata"}
+
+# Documents are stored as the "chroma:document" metadata row of their embedding
+_DUPLICATE_GROUPS_SQL = """
+    SELECT em.string_value AS document, COUNT(*) AS c
+    FROM embedding_metadata em
+    JOIN embeddings e ON e.id = em.id
+    JOIN segments s ON s.id = e.segment_id
+    JOIN collections col ON col.id = s.collection
+    WHERE em.key = 'chroma:document' AND col.name = ?
+    GROUP BY em.string_value
+"""
+
+
+if numba is not None:
+    # Single-threaded on purpose: searches run on to_thread workers, and launching
+    # a parallel kernel from several threads at once aborts the process under
+    # numba's workqueue threading layer. At memory-index sizes thread launch
+    # overhead would dominate anyway.
+    @numba.njit(cache=True, fastmath=True)
+    def _dot_scores(matrix, query):
+        """Row-wise dot products of int8 rows with a float32 query, without upcasting the rows"""
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in range(matrix.shape[0]):
+            total = 0.0
+            for j in range(matrix.shape[1]):
+                total += matrix[i, j] * query[j]
+            scores[i] = total
+        return scores
+else:
+    _dot_scores = None
+
+
+class QuantizedIndex:
+    """
+    Scalar int8 copy of L2-normalized embeddings for brute-force scoring.
+    
+    Each vector is scaled by its own absmax into [-127, 127], so the index is
+    4x smaller than float32 while cosine ranking is preserved to within
+    quantization error. Queries stay float32 and are scored with a single
+    matrix-vector product, rescaled per row.
+    """
+    
+    def __init__(self, vectors: np.ndarray):
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        self.scales = scales.astype(np.float32)
+        self.codes = np.round(vectors / self.scales[:, np.newaxis]).astype(np.int8)
+        if _dot_scores is not None:
+            # Compile (or load from cache) at build time rather than on the first query
+            _dot_scores(self.codes[:1], np.zeros(self.codes.shape[1], dtype=np.float32))
+    
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+    
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a normalized query against every row"""
+        if _dot_scores is not None:
+            # Avoids materializing a float32 copy of the int8 codes per query
+            return _dot_scores(self.codes, query) * self.scales
+        return (self.codes @ query) * self.scales
+    
+    def scores_batch(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarities of normalized queries (one per row) as a (rows, queries) matrix"""
+        # One matrix product; the float32 upcast of the codes is shared by every query
+        return (self.codes @ queries.T) * self.scales[:, np.newaxis]
+
+
+class InMemoryRetriever(VectorStore):
+    """
+    Brute-force vector store over a fixed set of documents held in memory.
+    
+    For FAQ-sized corpora a single matrix-vector product over all normalized
+    embeddings is far cheaper than Chroma's HNSW traversal and SQLite round
+    trip. Distances follow Chroma's default l2 space (squared L2 between unit
+    vectors, i.e. 2 - 2 * cosine) so results are interchangeable.
+    """
+    
+    def __init__(
+        self,
+        documents: List[Document],
+        embeddings: np.ndarray,
+        embedding_function: Embeddings,
+        quantize: bool = False
+    ):
+        """
+        Initialize the in-memory retriever
+        
+        Args:
+            documents: Documents to search
+            embeddings: Embedding matrix aligned with documents
+            embedding_function: Embeddings used to embed queries
+            quantize: Store vectors as int8 instead of float32
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = np.ascontiguousarray(vectors / norms)
+        
+        self.documents = list(documents)
+        self.embedding_function = embedding_function
+        self._quantized = QuantizedIndex(vectors) if quantize else None
+        self._matrix = None if quantize else vectors
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+    
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any
+    ) -> "InMemoryRetriever":
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
+        return cls(documents, np.asarray(embedding.embed_documents(texts)), embedding, **kwargs)
+    
+    def _similarities(self, query_embedding: List[float]) -> np.ndarray:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        
+        if self._quantized is not None:
+            return self._quantized.scores(query)
+        if simsimd is not None:
+            # One SIMD kernel over all rows; cdist returns cosine distances
+            distances = simsimd.cdist(query.reshape(1, -1), self._matrix, metric="cosine")
+            return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+        # BLAS matvec; faster than the numba kernel on float32 rows at every size
+        return self._matrix @ query
+    
+    def _similarities_batch(self, query_embeddings: List[List[float]]) -> np.ndarray:
+        """Similarities of every row to every query as a (rows, queries) matrix"""
+        queries = NormalizedEmbeddings._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        
+        if self._quantized is not None:
+            return self._quantized.scores_batch(queries)
+        if simsimd is not None:
+            distances = simsimd.cdist(queries, self._matrix, metric="cosine")
+            return 1.0 - np.asarray(distances, dtype=np.float32).T
+        return self._matrix @ queries.T
+    
+    def _candidates(self, filter: Optional[Dict]) -> Optional[np.ndarray]:
+        """Row indices matching a simple equality metadata filter"""
+        if not filter:
+            return None
+        return np.fromiter(
+            (
+                i for i, doc in enumerate(self.documents)
+                if all(doc.metadata.get(key) == value for key, value in filter.items())
+            ),
+            dtype=np.intp
+        )
+    
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """Return the top-k documents with squared L2 distances (lower is more similar)"""
+        similarities = self._similarities(embedding)
+        
+        rows = self._candidates(filter)
+        if rows is not None:
+            similarities = similarities[rows]
+        
+        k = min(k, similarities.shape[0])
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        
+        if rows is not None:
+            return [(self.documents[rows[i]], 2.0 - 2.0 * float(similarities[i])) for i in top]
+        return [(self.documents[i], 2.0 - 2.0 * float(similarities[i])) for i in top]
+    
+    def similarity_search_by_vectors_with_score(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Top-k documents with squared L2 distances for each query embedding
+        
+        All queries are scored with a single matrix product instead of one
+        matrix-vector product per query.
+        """
+        similarities = self._similarities_batch(embeddings)
+        
+        k = min(k, similarities.shape[0])
+        if k <= 0:
+            return [[] for _ in range(similarities.shape[1])]
+        top = np.argpartition(-similarities, k - 1, axis=0)[:k]
+        
+        results = []
+        for column in range(similarities.shape[1]):
+            scores = similarities[:, column]
+            rows = top[:, column]
+            rows = rows[np.argsort(-scores[rows])]
+            results.append([(self.documents[i], 2.0 - 2.0 * float(scores[i])) for i in rows])
+        return results
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self.embedding_function.embed_query(query), k=k, filter=filter
+        )
+    
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+    
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return unit_relevance
+
+
+class BaseVectorStoreManager:
+    """
+    Backend-independent orchestration shared by the vector store managers.
+    
+    Owns embedding, deduplication, the in-memory index, the search result
+    cache and the cached document count. Subclasses provide the storage
+    primitives (_open_new_store, _open_existing_store, _write_documents,
+    _query_store, _count) along with delete_collection, reset_vector_store
+    and the bulk read methods.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str,
+        collection_name: str,
+        query_cache_threshold: float = 0.97,
+        query_cache_size: int = 512,
+        quantize: Optional[bool] = None
+    ):
+        """
+        Initialize the vector store manager
+        
+        Args:
+            persist_directory: Directory the store persists to
+            collection_name: Name of the collection
+            query_cache_threshold: Minimum cosine similarity between two query
+                embeddings for search results to be reused
+            query_cache_size: Maximum number of cached searches (oldest evicted first)
+            quantize: Hold the in-memory search index as int8 instead of float32
+                (defaults to MEMORY_INDEX_QUANTIZE, then False)
+        """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
-        self.embedding_manager = EmbeddingManager()
+        # Kept outside the persist directory so it survives reset_vector_store
+        self.embedding_manager = EmbeddingManager(
+            cache_path=persist_directory.rstrip(os.sep) + "_embedding_cache.sqlite3"
+        )
+        self._embed = NormalizedEmbeddings(self.embedding_manager.get_embeddings_instance())
         self.vector_store = None
+        self.memory_index = None
+        self._cached_count: Optional[int] = None
+        self.memory_index_max_docs = int(os.getenv("MEMORY_INDEX_MAX_DOCS", "10000"))
+        if quantize is None:
+            quantize = os.getenv("MEMORY_INDEX_QUANTIZE", "false").lower() == "true"
+        self.memory_index_quantize = quantize
+        self.query_cache_threshold = query_cache_threshold
+        self.query_cache_size = query_cache_size
+        self._qcache = VectorRing(query_cache_size)
+        self._qcache_lock = threading.Lock()
         os.makedirs(persist_directory, exist_ok=True)
-        
-        self.chroma_client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
+
+    @property
+    def _location(self) -> str:
+        """Where the store persists, for log messages"""
+        return self.persist_directory
+
+    def _open_new_store(self) -> None:
+        """Create an empty store and assign it to self.vector_store"""
+        raise NotImplementedError
+
+    def _open_existing_store(self) -> None:
+        """Open the persisted store and assign it to self.vector_store"""
+        raise NotImplementedError
+
+    def _write_documents(self, documents: List[Document], embeddings: Optional[np.ndarray] = None) -> None:
+        """Upsert unique documents, embedding them first when embeddings is None"""
+        raise NotImplementedError
+
+    def _query_store(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        filter_dict: Optional[Dict]
+    ) -> List[List[Tuple[Document, float]]]:
+        """Top-k documents with squared L2 distances for each normalized query embedding"""
+        raise NotImplementedError
+
+    def _count(self) -> int:
+        """Number of documents in the store"""
+        raise NotImplementedError
 
     def delete_collection(self) -> None:
-        """Delete the collection from ChromaDB"""
-        try:
-            self.chroma_client.delete_collection(name=self.collection_name)
-            print(f"Deleted collection: {self.collection_name}")
-            self.vector_store = None
-        except Exception as e:
-            print(f"Note: Could not delete collection (may not exist): {e}")
+        raise NotImplementedError
+
+    def iter_all_documents(self, batch: int = 10_000) -> Iterator[Document]:
+        raise NotImplementedError
+
+    def _forget_contents(self) -> None:
+        """Drop every in-process view of the store; call after deleting it"""
+        self.vector_store = None
+        self.memory_index = None
+        self._cached_count = None
+        self._clear_query_cache()
+
+    def _clear_query_cache(self) -> None:
+        """Drop cached search results; call whenever the collection changes"""
+        with self._qcache_lock:
+            self._qcache.clear()
 
-    def create_vector_store(self, documents: List[Document]) -> None:
-        """Create a new vector store with proper cleanup"""
+    def _cached_search(
+        self,
+        kind: str,
+        query: str,
+        k: int,
+        search: Callable[[], List[Tuple[Document, float]]]
+    ) -> List[Tuple[Document, float]]:
+        """
+        Return results of an earlier search whose query embedding is nearly
+        identical, otherwise run the search and cache its results.
+        
+        The query embedding comes from the embedding manager's LRU, so the
+        store's own embed_query on a miss costs nothing extra.
+        """
+        query_vector = np.asarray(self._embed.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector = query_vector / norm
+        key = (kind, k)
+        
+        with self._qcache_lock:
+            similarities = self._qcache.similarities(query_vector)
+            if similarities is not None:
+                # Only entries from the same kind of search with the same k qualify
+                for i in np.argsort(-similarities):
+                    if similarities[i] < self.query_cache_threshold:
+                        break
+                    entry_key, results = self._qcache.value(i)
+                    if entry_key == key:
+                        return results
+        
+        results = search()
+        
+        with self._qcache_lock:
+            self._qcache.put(query_vector, (key, results))
+        
+        return results
+
+    def create_vector_store(
+        self,
+        documents: List[Document],
+        embeddings: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Create a new vector store with proper cleanup
+        
+        Args:
+            documents: Documents to store
+            embeddings: Precomputed embeddings aligned with documents; when
+                given, documents are inserted without calling the embedding API
+        """
         if not documents:
-            print("Warning: No documents provided to create vector store")
+            logger.warning("No documents provided to create vector store")
             return
         
         self.delete_collection()
         
-        print(f"Creating vector store with {len(documents)} documents...")
+        documents, embeddings = unique_documents(documents, embeddings)
+        logger.info("Creating vector store with %d documents...", len(documents))
         
-        self.vector_store = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embedding_manager.get_embeddings_instance(),
-            client=self.chroma_client,
-            collection_name=self.collection_name
-        )
+        self._open_new_store()
+        self._write_documents(documents, embeddings)
+        self._cached_count = None
+        if embeddings is not None:
+            self.build_memory_index(documents, embeddings)
         
-        print(f"Vector store created and persisted to {self.persist_directory}")
+        logger.info("Vector store created and persisted to %s", self._location)
         
-        actual_count = self.get_collection_count()
+        actual_count = self.get_collection_count(refresh=True)
         expected_count = len(documents)
         
         if actual_count != expected_count:
-            print(f" WARNING: Expected {expected_count} documents but got {actual_count}")
-            print("   This indicates duplicate entries may exist")
+            logger.warning(
+                "Expected %d documents but got %d; duplicate entries may exist",
+                expected_count,
+                actual_count
+            )
         else:
-            print(f"Verified: {actual_count} documents stored correctly")
+            logger.info("Verified: %d documents stored correctly", actual_count)
 
     def load_vector_store(self) -> None:
         """Load existing vector store from disk"""
-        print(f"Loading vector store from {self.persist_directory}...")
+        logger.info("Loading vector store from %s...", self._location)
+        self._cached_count = None
+        self._open_existing_store()
         
-        self.vector_store = Chroma(
-            client=self.chroma_client,
-            embedding_function=self.embedding_manager.get_embeddings_instance(),
-            collection_name=self.collection_name
+        count = self.get_collection_count()
+        logger.info("Vector store loaded successfully with %d documents", count)
+
+    def build_memory_index(self, documents: List[Document], embeddings: np.ndarray) -> None:
+        """
+        Build an in-memory brute-force index over the store so unfiltered
+        searches skip it. Only used for small corpora, and only when the
+        given documents are exactly what the store holds.
+        """
+        if len(documents) > self.memory_index_max_docs:
+            self.memory_index = None
+            return
+        
+        self.memory_index = InMemoryRetriever(
+            documents,
+            embeddings,
+            self._embed,
+            quantize=self.memory_index_quantize
         )
+        logger.info("Built in-memory search index over %d documents", len(self.memory_index))
+
+    def as_retriever(self, **kwargs):
+        """Get a LangChain retriever backed by the fastest available store"""
+        if not self.vector_store:
+            raise ValueError("Vector store not initialized. Call create_vector_store or load_vector_store first.")
         
-        count = self.get_collection_count()
-        print(f"Vector store loaded successfully with {count} documents")
+        if self.memory_index is not None:
+            return self.memory_index.as_retriever(**kwargs)
+        return self.vector_store.as_retriever(**kwargs)
 
     def similarity_search(
         self,
@@ -84,41 +578,96 @@ class VectorStoreManager:
         """Search for similar documents with relevance scores"""
         if not self.vector_store:
             raise ValueError("Vector store not initialized. Call create_vector_store or load_vector_store first.")
+
+        def search() -> List[Tuple[Document, float]]:
+            vector = self._embed.embed_query(query)
+            return self._search_by_vectors([vector], k, filter_dict)[0]
         
-        results = self.vector_store.similarity_search_with_relevance_scores(
-            query=query,
-            k=k,
-            filter=filter_dict
-        )
-        return results
+        if filter_dict:
+            return search()
+        return self._cached_search("relevance", query, k, search)
 
-    def reset_vector_store(self) -> None:
-        """Completely reset the vector store (delete everything)"""
-        self.delete_collection()
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 3,
+        filter_dict: Dict = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Search for several queries at once with relevance scores
         
-        if os.path.exists(self.persist_directory):
-            shutil.rmtree(self.persist_directory)
-            print(f"Vector store directory deleted from {self.persist_directory}")
+        Queries missing from the query cache are embedded in one call and
+        scored together by the in-memory index or the store.
         
-        self.vector_store = None
+        Returns:
+            One result list per query, in query order
+        """
+        if not self.vector_store:
+            raise ValueError("Vector store not initialized. Call create_vector_store or load_vector_store first.")
+        if not queries:
+            return []
         
-        os.makedirs(self.persist_directory, exist_ok=True)
-        self.chroma_client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
+        vectors = NormalizedEmbeddings._normalize(
+            np.asarray(self.embedding_manager.embed_queries(queries), dtype=np.float32)
         )
+        return self._search_by_vectors(vectors, k, filter_dict)
+
+    def _search_by_vectors(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        filter_dict: Optional[Dict]
+    ) -> List[List[Tuple[Document, float]]]:
+        """Top-k documents with relevance scores for each query embedding"""
+        if self.memory_index is not None and not filter_dict:
+            batch = self.memory_index.similarity_search_by_vectors_with_score(vectors, k=k)
+        else:
+            batch = self._query_store(vectors, k, filter_dict)
+        
+        return [
+            [(doc, unit_relevance(distance)) for doc, distance in results]
+            for results in batch
+        ]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 3,
+        filter_dict: Dict = None
+    ) -> List[Tuple[Document, float]]:
+        """Search for similar documents with squared L2 distances between normalized embeddings (lower is more similar)"""
+        if not self.vector_store:
+            raise ValueError("Vector store not initialized. Call create_vector_store or load_vector_store first.")
 
-    def get_collection_count(self) -> int:
-        """Get the number of documents in the collection"""
+        def search() -> List[Tuple[Document, float]]:
+            vector = self._embed.embed_query(query)
+            if self.memory_index is not None and not filter_dict:
+                return self.memory_index.similarity_search_by_vector_with_score(vector, k=k)
+            return self._query_store([vector], k, filter_dict)[0]
+        
+        if filter_dict:
+            return search()
+        return self._cached_search("distance", query, k, search)
+
+    def get_collection_count(self, refresh: bool = False) -> int:
+        """
+        Get the number of documents in the store
+        
+        The count is cached after the first query and dropped whenever this
+        manager writes to or deletes the store.
+        
+        Args:
+            refresh: Query the store even if a cached count exists
+        """
         if not self.vector_store:
             return 0
+        if self._cached_count is not None and not refresh:
+            return self._cached_count
         try:
-            return self.vector_store._collection.count()
+            self._cached_count = self._count()
+            return self._cached_count
         except Exception as e:
-            print(f"Error getting collection count: {e}")
+            logger.error("Error getting collection count: %s", e)
             return 0
 
     def add_documents(self, documents: List[Document]) -> None:
@@ -127,71 +676,422 @@ class VectorStoreManager:
             raise ValueError("Vector store not initialized")
         
         if not documents:
-            print("Warning: No documents provided to add")
+            logger.warning("No documents provided to add")
             return
         
         before_count = self.get_collection_count()
-        print(f"Adding {len(documents)} documents to vector store...")
+        documents, _ = unique_documents(documents)
+        logger.info("Adding %d documents to vector store...", len(documents))
         
-        self.vector_store.add_documents(documents)
+        self._write_documents(documents)
+        # Upserts may overwrite existing rows, so the new size is only known by
+        # counting; the in-memory index and cached results no longer mirror the store
+        self._cached_count = None
+        self.memory_index = None
+        self._clear_query_cache()
         
         after_count = self.get_collection_count()
-        print(f"Documents added successfully (total: {after_count}, was: {before_count})")
+        logger.info("Documents added successfully (total: %d, was: %d)", after_count, before_count)
 
     def get_all_documents(self) -> List[Document]:
         """Retrieve all documents from the vector store"""
-        if not self.vector_store:
+        try:
+            return list(self.iter_all_documents())
+        except Exception as e:
+            logger.error("Error retrieving documents: %s", e)
             return []
+
+
+class VectorStoreManager(BaseVectorStoreManager):
+    """Vector store manager backed by a persistent ChromaDB collection"""
+
+    # Chroma wrappers shared by managers in this process, keyed by (persist_directory, collection_name)
+    _store_cache: ClassVar[Dict[Tuple[str, str], Chroma]] = {}
+    _store_lock: ClassVar[threading.Lock] = threading.Lock()
+    _tuning_skip_logged: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        persist_directory: str,
+        collection_name: str,
+        query_cache_threshold: float = 0.97,
+        query_cache_size: int = 512,
+        quantize: Optional[bool] = None
+    ):
+        """
+        Initialize the Chroma client; arguments are as for BaseVectorStoreManager,
+        with persist_directory holding ChromaDB's files
+        """
+        super().__init__(
+            persist_directory,
+            collection_name,
+            query_cache_threshold=query_cache_threshold,
+            query_cache_size=query_cache_size,
+            quantize=quantize
+        )
+        self._distance_scale = 1.0
         
+        self.chroma_client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
+            )
+        )
+        self._tune_sqlite()
+
+    def _tune_sqlite(self) -> None:
+        """
+        Apply bulk-ingestion pragmas to Chroma's SQLite database.
+        
+        Only Python-backed Chroma (0.4/0.5) exposes its connection pool, so the
+        pragmas reach the connection Chroma actually writes with. The
+        Rust-backed client (1.x) that requirements.txt pins owns its
+        connections and is left untouched: changing the journal mode from a
+        second connection corrupts its view of the database. On it this is a
+        no-op, logged once at DEBUG.
+        """
         try:
-            collection = self.vector_store._collection
-            results = collection.get()
-            
-            documents = []
-            for i in range(len(results['ids'])):
-                doc = Document(
-                    page_content=results['documents'][i],
-                    metadata=results['metadatas'][i] if results['metadatas'] else {}
-                )
-                documents.append(doc)
+            conn_pool = self.chroma_client._server._sysdb._conn_pool
+        except AttributeError:
+            if not VectorStoreManager._tuning_skip_logged:
+                VectorStoreManager._tuning_skip_logged = True
+                logger.debug("Chroma client does not expose its SQLite connections; skipping pragma tuning")
+            return
+        
+        try:
+            conn = conn_pool.connect()
+            for pragma in _SQLITE_PRAGMAS:
+                conn.execute(pragma)
+        except Exception as e:
+            logger.info("Could not tune SQLite settings: %s", e)
+
+    @property
+    def _store_key(self) -> Tuple[str, str]:
+        return (os.path.abspath(self.persist_directory), self.collection_name)
+
+    def _collection_distance_scale(self) -> float:
+        """Scale from the loaded collection's distance space to squared L2"""
+        metadata = self.vector_store._collection.metadata or {}
+        return _DISTANCE_SCALE.get(metadata.get("hnsw:space", "l2"), 1.0)
+
+    def _forget_store(self) -> None:
+        """Drop the shared Chroma wrapper for this collection"""
+        with self._store_lock:
+            self._store_cache.pop(self._store_key, None)
+
+    def _embed_batches(
+        self,
+        batches: List[List[Document]],
+        max_workers: int = 4
+    ) -> Iterator[List[List[float]]]:
+        """
+        Embed batches concurrently, yielding results in batch order.
+        
+        Up to max_workers batches are in flight with the embedding provider
+        while the caller writes earlier batches to Chroma.
+        """
+        def embed(batch: List[Document]) -> List[List[float]]:
+            # Jitter request starts so workers don't hit rate limits in lockstep
+            time.sleep(random.uniform(0, 0.05))
+            return self._embed.embed_documents([doc.page_content for doc in batch])
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(embed, batch) for batch in batches]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _write_documents(
+        self,
+        documents: List[Document],
+        embeddings: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Upsert documents into the collection in fixed-size batches.
+        
+        Ids are content hashes, so re-ingesting a document overwrites its
+        existing row instead of adding a duplicate. Callers pass documents
+        through unique_documents first so no batch repeats an id.
+        """
+        batches = [documents[start:start + _BATCH_SIZE] for start in range(0, len(documents), _BATCH_SIZE)]
+        if embeddings is None:
+            batch_embeddings = self._embed_batches(batches)
+        else:
+            batch_embeddings = (
+                embeddings[start:start + _BATCH_SIZE]
+                for start in range(0, len(documents), _BATCH_SIZE)
+            )
+        
+        for batch_number, (batch, vectors) in enumerate(zip(batches, batch_embeddings), start=1):
+            # Write straight to the collection; the wrapper would embed again
+            self.vector_store._collection.upsert(
+                ids=[content_id(doc) for doc in batch],
+                embeddings=NormalizedEmbeddings._normalize(np.asarray(vectors, dtype=np.float32)),
+                documents=[doc.page_content for doc in batch],
+                # Chroma rejects empty metadata dicts but accepts None
+                metadatas=[doc.metadata or None for doc in batch]
+            )
             
-            return documents
+            if batch_number % 10 == 0 or batch_number == len(batches):
+                logger.debug("Added batch %d/%d", batch_number, len(batches))
+
+    def _chroma(self) -> Chroma:
+        """Chroma wrapper over this manager's collection, created if missing"""
+        return Chroma(
+            client=self.chroma_client,
+            embedding_function=self._embed,
+            collection_name=self.collection_name,
+            collection_metadata=_HNSW_METADATA
+        )
+
+    def _open_new_store(self) -> None:
+        self.vector_store = self._chroma()
+        with self._store_lock:
+            self._store_cache[self._store_key] = self.vector_store
+        self._distance_scale = self._collection_distance_scale()
+
+    def _open_existing_store(self) -> None:
+        with self._store_lock:
+            store = self._store_cache.get(self._store_key)
+            if store is None:
+                store = self._chroma()
+                self._store_cache[self._store_key] = store
+        self.vector_store = store
+        # Collections created before the switch to ip keep their l2 space
+        self._distance_scale = self._collection_distance_scale()
+
+    def _count(self) -> int:
+        return self.vector_store._collection.count()
+
+    def delete_collection(self) -> None:
+        """Delete the collection from ChromaDB"""
+        self._forget_store()
+        try:
+            self.chroma_client.delete_collection(name=self.collection_name)
+            logger.info("Deleted collection: %s", self.collection_name)
+            self._forget_contents()
         except Exception as e:
-            print(f"Error retrieving documents: {e}")
-            return []
+            logger.info("Could not delete collection (may not exist): %s", e)
+
+    @staticmethod
+    def _where(filter_dict: Optional[Dict]) -> Optional[Dict]:
+        """
+        Translate a metadata filter into a Chroma where clause
+        
+        Chroma accepts a single field per where dict, so multi-field equality
+        filters are combined with $and. Building the clause costs about as
+        much as hashing the filter, so it is not cached.
+        """
+        if not filter_dict:
+            return None
+        if len(filter_dict) == 1:
+            return dict(filter_dict)
+        return {"$and": [{field: value} for field, value in filter_dict.items()]}
+
+    def _query_store(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        filter_dict: Optional[Dict]
+    ) -> List[List[Tuple[Document, float]]]:
+        """Query Chroma directly, returning squared L2 distances for each query embedding"""
+        raw = self.vector_store._collection.query(
+            query_embeddings=np.asarray(vectors, dtype=np.float32),
+            n_results=k,
+            where=self._where(filter_dict),
+            include=['documents', 'metadatas', 'distances']
+        )
+        return [
+            [
+                (Document(id=doc_id, page_content=content, metadata=metadata or {}), distance * self._distance_scale)
+                for doc_id, content, metadata, distance in zip(ids, documents, metadatas, distances)
+                if content is not None
+            ]
+            for ids, documents, metadatas, distances in zip(
+                raw['ids'], raw['documents'], raw['metadatas'], raw['distances']
+            )
+        ]
+
+    def _release_client(self) -> None:
+        """
+        Stop this client's Chroma system and evict it from chromadb's
+        process-wide system cache, so the next client for this path opens
+        fresh files instead of reusing handles to deleted ones.
+        
+        Only this path's system is touched; clients for other paths keep
+        running. Managers sharing this path lose their store anyway, since
+        the directory is about to be deleted.
+        """
+        system = SharedSystemClient._identifier_to_system.pop(self.chroma_client._identifier, None)
+        if system is not None:
+            system.stop()
+        
+        persist_directory = os.path.abspath(self.persist_directory)
+        with self._store_lock:
+            for key in [key for key in self._store_cache if key[0] == persist_directory]:
+                del self._store_cache[key]
+
+    def reset_vector_store(self) -> None:
+        """Completely reset the vector store (delete everything)"""
+        self.delete_collection()
+        self._release_client()
+        
+        if os.path.exists(self.persist_directory):
+            discard_directory(self.persist_directory)
+            logger.info("Vector store directory deleted from %s", self.persist_directory)
+        
+        self._forget_contents()
+        
+        os.makedirs(self.persist_directory, exist_ok=True)
+        self.chroma_client = chromadb.PersistentClient(
+            path=self.persist_directory,
+            settings=Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
+            )
+        )
+        self._tune_sqlite()
+
+    def _iter_collection_pages(self, include: List[str], batch: int = 10_000) -> Iterator[dict]:
+        """
+        Yield collection.get() results batch rows at a time so large
+        collections are never materialized in one call.
+        
+        Args:
+            include: Columns to fetch; always explicit, since the default pulls
+                more than callers need and 'embeddings' is never wanted here
+            batch: Rows per get() call
+        """
+        if not self.vector_store:
+            return
+        
+        collection = self.vector_store._collection
+        offset = 0
+        while True:
+            results = collection.get(limit=batch, offset=offset, include=include)
+            if not results['ids']:
+                break
+            
+            yield results
+            
+            if len(results['ids']) < batch:
+                break
+            offset += batch
+
+    def iter_all_documents(self, batch: int = 10_000) -> Iterator[Document]:
+        """Yield every document in the collection, fetching batch rows at a time"""
+        for results in self._iter_collection_pages(['documents', 'metadatas'], batch):
+            metadatas = results['metadatas'] or [{}] * len(results['ids'])
+            for content, metadata in zip(results['documents'], metadatas):
+                yield Document(page_content=content, metadata=metadata or {})
+
+    def get_all_raw(self) -> Tuple[List[str], List[str], List[dict]]:
+        """
+        Retrieve every document as parallel (ids, contents, metadatas) lists,
+        for callers that don't need Document objects
+        """
+        ids: List[str] = []
+        contents: List[str] = []
+        metadatas: List[dict] = []
+        for results in self._iter_collection_pages(['documents', 'metadatas']):
+            ids.extend(results['ids'])
+            contents.extend(results['documents'])
+            # Chroma returns None for rows stored without metadata
+            metadatas.extend(metadata or {} for metadata in results['metadatas'] or [None] * len(results['ids']))
+        return ids, contents, metadatas
 
     def check_for_duplicates(self) -> dict:
         """Check if there are duplicate documents in the vector store"""
-        documents = self.get_all_documents()
+        report = self._check_for_duplicates_sql()
+        if report is not None:
+            return report
+        return self._check_for_duplicates_python()
+
+    def _check_for_duplicates_sql(self) -> Optional[dict]:
+        """
+        Count duplicate documents with a GROUP BY inside Chroma's SQLite file,
+        so no document content is pulled into Python.
         
-        if not documents:
-            return {
-                'total_documents': 0,
-                'unique_documents': 0,
-                'duplicate_groups': 0,
-                'duplicates': []
-            }
-        
-        content_map = {}
-        duplicates = []
-        
-        for doc in documents:
-            content = doc.page_content
-            if content in content_map:
-                duplicates.append({
-                    'content_preview': content[:100] + "...",
-                    'count': content_map[content] + 1
-                })
-                content_map[content] += 1
-            else:
-                content_map[content] = 1
-        
-        unique_count = len([c for c in content_map.values() if c == 1])
-        duplicate_count = len([c for c in content_map.values() if c > 1])
+        The database is opened read-only and never modified. Returns None when
+        the schema is not the expected one or the result disagrees with the
+        collection count, so the caller can fall back to the Python scan.
+        """
+        if not self.vector_store:
+            return None
+        
+        db_path = os.path.join(self.persist_directory, "chroma.sqlite3")
+        if not os.path.exists(db_path):
+            return None
+        
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+                if not _DUPLICATE_SCAN_TABLES <= tables:
+                    return None
+                
+                total, unique, groups = conn.execute(
+                    f"SELECT COALESCE(SUM(c), 0), COALESCE(SUM(c = 1), 0), COALESCE(SUM(c > 1), 0) "
+                    f"FROM ({_DUPLICATE_GROUPS_SQL})",
+                    (self.collection_name,)
+                ).fetchone()
+                previews = conn.execute(
+                    f"SELECT substr(document, 1, 100), c FROM ({_DUPLICATE_GROUPS_SQL}) "
+                    f"WHERE c > 1 ORDER BY c DESC LIMIT 5",
+                    (self.collection_name,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.info("SQL duplicate scan unavailable, scanning in Python: %s", e)
+            return None
+        
+        if total != self.get_collection_count(refresh=True):
+            return None
+        
+        return {
+            'total_documents': total,
+            'unique_documents': unique,
+            'duplicate_groups': groups,
+            'duplicates': [
+                {'content_preview': preview + "...", 'count': count}
+                for preview, count in previews
+            ]
+        }
+
+    def _check_for_duplicates_python(self) -> dict:
+        """Check for duplicates by streaming every document through Python"""
+        counts = Counter()
+        previews: Dict[bytes, str] = {}
+        total = 0
+        
+        try:
+            # Grouping only needs content, so metadatas are never fetched
+            for results in self._iter_collection_pages(['documents']):
+                for content in results['documents']:
+                    total += 1
+                    # Hash once to a short digest instead of keying dicts on full page content
+                    key = blake2b(content.encode(), digest_size=16).digest()
+                    counts[key] += 1
+                    if counts[key] == 2:
+                        previews[key] = content[:100]
+        except Exception as e:
+            logger.error("Error retrieving documents: %s", e)
+            counts.clear()
+            previews.clear()
+            total = 0
+        
+        duplicates = [
+            {'content_preview': preview + "...", 'count': counts[key]}
+            for key, preview in previews.items()
+        ]
         
         return {
-            'total_documents': len(documents),
-            'unique_documents': unique_count,
-            'duplicate_groups': duplicate_count,
+            'total_documents': total,
+            'unique_documents': sum(1 for c in counts.values() if c == 1),
+            'duplicate_groups': len(previews),
             'duplicates': duplicates[:5]  
         }
\ No newline at end of file
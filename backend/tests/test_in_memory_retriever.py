@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from rag.vector_store import InMemoryRetriever
+
+N_DOCS = 300
+DIM = 384
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(7)
+    embeddings = rng.standard_normal((N_DOCS, DIM)).astype(np.float32)
+    queries = rng.standard_normal((8, DIM)).astype(np.float32)
+    documents = [
+        Document(page_content=f"doc {i}", metadata={"group": i % 3})
+        for i in range(N_DOCS)
+    ]
+    return documents, embeddings, queries
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _reference(embeddings, query, k, rows=None):
+    """Row indices of the top-k cosine matches, best first, and their cosines"""
+    rows = np.arange(len(embeddings)) if rows is None else np.asarray(rows)
+    cosines = _unit(embeddings[rows]) @ _unit(query)
+    order = np.argsort(-cosines)[:k]
+    return rows[order], cosines[order]
+
+
+def test_search_matches_argsort_reference(corpus):
+    documents, embeddings, queries = corpus
+    index = InMemoryRetriever(documents, embeddings, None)
+
+    for query in queries:
+        results = index.similarity_search_by_vector_with_score(query.tolist(), k=5)
+        rows, cosines = _reference(embeddings, query, 5)
+
+        assert [doc.page_content for doc, _ in results] == [f"doc {i}" for i in rows]
+        np.testing.assert_allclose([distance for _, distance in results], 2.0 - 2.0 * cosines, atol=1e-5)
+
+
+def test_filtered_search_maps_back_to_documents(corpus):
+    documents, embeddings, queries = corpus
+    index = InMemoryRetriever(documents, embeddings, None)
+    group_rows = [i for i, doc in enumerate(documents) if doc.metadata["group"] == 1]
+
+    results = index.similarity_search_by_vector_with_score(queries[0].tolist(), k=4, filter={"group": 1})
+    rows, _ = _reference(embeddings, queries[0], 4, rows=group_rows)
+
+    assert [doc.page_content for doc, _ in results] == [f"doc {i}" for i in rows]
+    assert all(doc.metadata["group"] == 1 for doc, _ in results)
+
+
+def test_filter_without_matches_returns_nothing(corpus):
+    documents, embeddings, queries = corpus
+    index = InMemoryRetriever(documents, embeddings, None)
+
+    assert index.similarity_search_by_vector_with_score(queries[0].tolist(), k=3, filter={"group": 9}) == []
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_batched_search_matches_per_query_search(corpus, quantize):
+    documents, embeddings, queries = corpus
+    index = InMemoryRetriever(documents, embeddings, None, quantize=quantize)
+
+    batched = index.similarity_search_by_vectors_with_score(queries.tolist(), k=6)
+    single = [index.similarity_search_by_vector_with_score(query.tolist(), k=6) for query in queries]
+
+    assert len(batched) == len(queries)
+    for batch_results, query_results in zip(batched, single):
+        assert [doc.page_content for doc, _ in batch_results] == [doc.page_content for doc, _ in query_results]
+        np.testing.assert_allclose(
+            [distance for _, distance in batch_results],
+            [distance for _, distance in query_results],
+            atol=1e-4
+        )
+
+
+def test_int8_ranking_matches_float32(corpus):
+    documents, embeddings, _ = corpus
+    exact = InMemoryRetriever(documents, embeddings, None)
+    quantized = InMemoryRetriever(documents, embeddings, None, quantize=True)
+
+    # Queries mixing three documents with falling weights have a clear top 3,
+    # so int8 rounding must not reorder them
+    rng = np.random.default_rng(11)
+    unit = _unit(embeddings)
+    for _ in range(8):
+        picks = rng.choice(N_DOCS, size=3, replace=False)
+        query = unit[picks].T @ np.array([0.6, 0.4, 0.25]) + 0.01 * rng.standard_normal(DIM)
+
+        expected = exact.similarity_search_by_vector_with_score(query.tolist(), k=3)
+        actual = quantized.similarity_search_by_vector_with_score(query.tolist(), k=3)
+
+        assert [doc.page_content for doc, _ in expected] == [f"doc {i}" for i in picks]
+        assert [doc.page_content for doc, _ in actual] == [doc.page_content for doc, _ in expected]
+        np.testing.assert_allclose(
+            [distance for _, distance in actual],
+            [distance for _, distance in expected],
+            atol=0.02
+        )
\ No newline at end of file
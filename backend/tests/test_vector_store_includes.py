@@ -0,0 +1,28 @@
+import ast
+from pathlib import Path
+
+VECTOR_STORE_PATH = Path(__file__).resolve().parent.parent / "rag" / "vector_store.py"
+
+
+def _include_lists(tree: ast.AST):
+    """Yield (lineno, list node) for every literal include list passed to a Chroma read"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            for keyword in node.keywords:
+                if keyword.arg == "include" and isinstance(keyword.value, (ast.List, ast.Tuple)):
+                    yield node.lineno, keyword.value
+            # Positional include lists, e.g. self._iter_collection_pages(['documents', 'metadatas'])
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "_iter_collection_pages" and node.args:
+                if isinstance(node.args[0], (ast.List, ast.Tuple)):
+                    yield node.lineno, node.args[0]
+
+
+def test_vector_store_never_includes_embeddings():
+    tree = ast.parse(VECTOR_STORE_PATH.read_text(encoding="utf-8"))
+
+    found = list(_include_lists(tree))
+    assert found, "expected at least one include= list in vector_store.py"
+
+    for lineno, values in found:
+        names = [element.value for element in values.elts if isinstance(element, ast.Constant)]
+        assert "embeddings" not in names, f"vector_store.py:{lineno} fetches embeddings"
\ No newline at end of file